@@ -1,7 +1,12 @@
-from flask import Flask, url_for, redirect
+import atexit
+import threading
+import time
+import click
+from flask import Flask, url_for, redirect, jsonify
 from .config import Config
 
 def create_app():
+    started = time.perf_counter()
     app = Flask(__name__)
     app.config.from_object(Config)
 
@@ -18,4 +23,69 @@ def create_app():
     def home():
         return redirect(url_for('auth.login'))
 
-    return app
\ No newline at end of file
+    # Warm state: users, transactions and indexes loaded from the snapshot
+    # (or parsed from JSON) in the background so the worker starts serving
+    # immediately and /ready turns green once the data is in memory.
+    from .utils.snapshot import WarmSnapshot
+
+    warm_state = {'ready': False, 'source': None, 'time_to_ready_ms': None}
+    app.extensions['warm_state'] = warm_state
+
+    def load_warm_state():
+        try:
+            warm_state['source'] = WarmSnapshot.load()
+        except Exception:
+            # The models parse the JSON files on demand instead
+            warm_state['source'] = 'cold'
+        finally:
+            warm_state['time_to_ready_ms'] = round((time.perf_counter() - started) * 1000, 2)
+            warm_state['ready'] = True
+
+    if app.config['WARM_START']:
+        threading.Thread(target=load_warm_state, daemon=True).start()
+    else:
+        warm_state.update(ready=True, source='cold', time_to_ready_ms=0)
+
+    @app.route('/ready')
+    def ready():
+        return jsonify(warm_state), 200 if warm_state['ready'] else 503
+
+    @app.cli.command('snapshot')
+    def snapshot_command():
+        """Write a warm-start snapshot of the current data files."""
+        if WarmSnapshot.save():
+            print(f"Snapshot written to {app.config['SNAPSHOT_FILE']}")
+        else:
+            print("Nothing to snapshot.")
+
+    @app.cli.command('replay')
+    @click.option('--fraud-threshold', 'FRAUD_THRESHOLD', type=float, multiple=True)
+    @click.option('--frequency-threshold', 'FREQUENCY_THRESHOLD', type=int, multiple=True)
+    @click.option('--time-window', 'TIME_WINDOW_MINUTES', type=int, multiple=True)
+    @click.option('--withdrawal-percentage', 'LARGE_WITHDRAWAL_PERCENTAGE', type=float, multiple=True)
+    @click.option('--workers', type=int, default=1, help='Processes to split the grid across.')
+    def replay_command(workers, **values):
+        """Backtest fraud thresholds against the transaction history.
+
+        Each threshold option may be repeated; every combination is
+        evaluated and compared with the recorded statuses."""
+        from .utils.fraud_replay import FraudReplay
+        grid = FraudReplay.build_grid(**values)
+        for line in FraudReplay.report(FraudReplay.run(grid, workers)):
+            print(line)
+
+    # Work that only belongs to a process serving requests, not to CLI
+    # commands such as 'flask snapshot' or 'flask replay'
+    serving = threading.Lock()
+
+    @app.before_request
+    def start_serving():
+        if not serving.acquire(blocking=False):
+            return
+        if app.config['SNAPSHOT_ON_SHUTDOWN']:
+            atexit.register(WarmSnapshot.save)
+        if app.config['ASYNC_FRAUD_SCORING']:
+            from .utils.fraud_queue import FraudQueue
+            FraudQueue.start(app.config['FRAUD_SCORING_WORKERS'])
+
+    return app
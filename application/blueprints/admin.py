@@ -1,8 +1,9 @@
-from flask import Blueprint, render_template, flash, redirect, url_for, session
+from flask import Blueprint, render_template, flash, redirect, url_for, session, jsonify
 from ..models.user import User
 from ..models.transaction import Transaction
 from ..utils.decorators import admin_required
 from ..utils.helpers import Logger
+from ..utils.settlement import Settlement
 
 admin_bp = Blueprint('admin', __name__)
 
@@ -39,4 +40,35 @@ def clear_flag(user_email):
     if User.flag_user(user_email, False):
         Logger.log_event(session['user'], "CLEAR_FLAG", f"Cleared flag for {user_email}")
         flash(f"{user_email} fraud flag cleared.")
-    return redirect(url_for('admin.admin_dashboard'))
\ No newline at end of file
+    return redirect(url_for('admin.admin_dashboard'))
+
+@admin_bp.route('/release_txn/<txn_id>')
+@admin_required
+def release_txn(txn_id):
+    txn = Settlement.release_held(txn_id)
+    if txn:
+        Logger.log_event(session['user'], "RELEASE_HOLD",
+                         f"Released ₹{txn['amount']} from {txn['sender']} to {txn['receiver']} ({txn_id})")
+        flash(f"Transfer to {txn['receiver']} released.")
+    else:
+        flash("Transaction is not held.")
+    return redirect(url_for('admin.admin_dashboard'))
+
+@admin_bp.route('/reverse_txn/<txn_id>')
+@admin_required
+def reverse_txn(txn_id):
+    txn = Settlement.reverse_held(txn_id)
+    if txn:
+        Logger.log_event(session['user'], "REVERSE_HOLD",
+                         f"Refunded ₹{txn['amount']} to {txn['sender']} ({txn_id})")
+        flash(f"Transfer from {txn['sender']} reversed.")
+    else:
+        flash("Transaction is not held.")
+    return redirect(url_for('admin.admin_dashboard'))
+
+@admin_bp.route('/admin/fraud_queue')
+@admin_required
+def fraud_queue():
+    # Only loaded when the queue is inspected or async scoring is enabled
+    from ..utils.fraud_queue import FraudQueue
+    return jsonify(FraudQueue.stats())
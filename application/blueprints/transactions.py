@@ -1,9 +1,9 @@
-from flask import Blueprint, render_template, request, flash, redirect, url_for, session
+from flask import Blueprint, render_template, request, flash, redirect, url_for, session, current_app
 from ..models.user import User
 from ..models.transaction import Transaction
 from ..utils.decorators import login_required
 from ..utils.helpers import Logger
-from ..utils.fraud_detection import FraudDetector
+from ..utils.fraud_detection import FraudDetector, PENDING_REVIEW
 
 transactions_bp = Blueprint('transactions', __name__)
 
@@ -72,16 +72,25 @@ def send():
             flash("Insufficient balance.")
             return redirect(url_for('transactions.send'))
 
-        status = FraudDetector.check_fraud_patterns(email, amount)
+        if current_app.config['ASYNC_FRAUD_SCORING']:
+            status = FraudDetector.precheck(amount)
+        else:
+            status = FraudDetector.check_fraud_patterns(email, amount)
 
         User.update_balance(email, -amount)
-        User.update_balance(receiver, amount)
+        # A transfer awaiting asynchronous scoring is held back from the
+        # receiver until it passes
+        if status != PENDING_REVIEW:
+            User.update_balance(receiver, amount)
 
         if "FRAUD" in status:
             User.flag_user(email, True)
             flash("Transaction flagged for review due to suspicious activity.")
 
-        Transaction.create_transaction(email, receiver, amount, status)
+        txn = Transaction.create_transaction(email, receiver, amount, status)
+        if status == PENDING_REVIEW:
+            from ..utils.fraud_queue import FraudQueue
+            FraudQueue.submit(txn, sender_balance)
         Logger.log_event(email, "SEND_MONEY", f"Sent ₹{amount} to {receiver}, Status: {status}")
 
         if "FRAUD" not in status:
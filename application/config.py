@@ -6,9 +6,21 @@ class Config:
     USERS_FILE = 'users.json'
     TXNS_FILE = 'transactions.json'
     LOG_FILE = 'audit_log.json'
+    LOCK_FILE = 'data.lock'
 
     # Fraud detection
     FRAUD_THRESHOLD = 1000
     FREQUENCY_THRESHOLD = 5
     TIME_WINDOW_MINUTES = 10
-    LARGE_WITHDRAWAL_PERCENTAGE = 0.5
\ No newline at end of file
+    LARGE_WITHDRAWAL_PERCENTAGE = 0.5
+
+    # Asynchronous fraud scoring: /send only applies the hard amount limit and
+    # full scoring runs in background workers after the transfer is committed
+    ASYNC_FRAUD_SCORING = False
+    FRAUD_SCORING_WORKERS = 2
+    REVERSE_HELD_TRANSFERS = False
+
+    # Fast startup
+    SNAPSHOT_FILE = 'warm_snapshot.pkl'
+    WARM_START = True
+    SNAPSHOT_ON_SHUTDOWN = True
\ No newline at end of file
@@ -0,0 +1,85 @@
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from ..config import Config
+
+try:
+    import fcntl
+except ImportError:  # Windows: the lock only covers threads in this process
+    fcntl = None
+
+
+class DataLock:
+    """Re-entrant lock around the JSON data files, shared by the threads of
+    this process and, through an exclusive flock on LOCK_FILE, by every other
+    process using the same files."""
+
+    def __init__(self):
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        self._depth += 1
+        if self._depth == 1 and fcntl is not None:
+            try:
+                self._file = open(Config.LOCK_FILE, 'a')
+                fcntl.flock(self._file, fcntl.LOCK_EX)
+            except BaseException:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                self._depth -= 1
+                self._thread_lock.release()
+                raise
+        return self
+
+    def __exit__(self, *exc_info):
+        self._depth -= 1
+        if self._depth == 0 and self._file is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+        self._thread_lock.release()
+
+
+# Serialises cache fills and read-modify-write cycles on the JSON data files
+lock = DataLock()
+
+
+def file_signature(path):
+    """Return (inode, mtime_ns, size) for a data file, or None if it is missing
+    or empty. Every write replaces the file, so the inode changes even when a
+    coarse timestamp and the size do not."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    if stat.st_size == 0:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+@contextmanager
+def atomic_open(path, mode='w'):
+    """Open a uniquely named temp file next to path and move it over path
+    on success, so concurrent writers never interleave and readers never see
+    a truncated or half written file."""
+    directory, name = os.path.split(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=name + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_json(path, data):
+    with atomic_open(path) as f:
+        json.dump(data, f, indent=4)
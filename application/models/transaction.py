@@ -1,40 +1,113 @@
 import json
-import os
+import uuid
 from datetime import datetime
 from ..config import Config
+from .storage import file_signature, lock, write_json
 
 class Transaction:
+    # (file signature, txns, index) of the last read or write of TXNS_FILE;
+    # index maps each email to the positions of its transactions in txns.
+    # Like User._cache these are shared between threads and never changed in
+    # place: callers get copies and writers replace them once the file is saved.
+    _cache = None
+
+    @staticmethod
+    def _load():
+        with lock:
+            signature = file_signature(Config.TXNS_FILE)
+            if signature is None:
+                Transaction._cache = None
+                return [], {}
+            if Transaction._cache is not None and Transaction._cache[0] == signature:
+                return Transaction._cache[1], Transaction._cache[2]
+            with open(Config.TXNS_FILE, 'r') as f:
+                txns = json.load(f)
+            index = Transaction.build_index(txns)
+            Transaction._cache = (signature, txns, index)
+            return txns, index
+
+    @staticmethod
+    def _store(txns, index):
+        with lock:
+            write_json(Config.TXNS_FILE, txns)
+            Transaction._cache = (file_signature(Config.TXNS_FILE), txns, index)
+
     @staticmethod
     def load_transactions():
-        if not os.path.exists(Config.TXNS_FILE) or os.path.getsize(Config.TXNS_FILE) == 0:
-            return []
-        with open(Config.TXNS_FILE, 'r') as f:
-            return json.load(f)
+        return [dict(txn) for txn in Transaction._load()[0]]
 
     @staticmethod
     def save_transactions(txns):
-        with open(Config.TXNS_FILE, 'w') as f:
-            json.dump(txns, f, indent=4)
+        txns = [dict(txn) for txn in txns]
+        Transaction._store(txns, Transaction.build_index(txns))
+
+    @staticmethod
+    def build_index(txns):
+        index = {}
+        for pos, txn in enumerate(txns):
+            index.setdefault(txn['sender'], []).append(pos)
+            if txn['receiver'] != txn['sender']:
+                index.setdefault(txn['receiver'], []).append(pos)
+        return index
+
+    @staticmethod
+    def cached_state():
+        with lock:
+            Transaction._load()
+            return Transaction._cache
+
+    @staticmethod
+    def prime_cache(signature, txns, index):
+        with lock:
+            if signature is not None and signature == file_signature(Config.TXNS_FILE):
+                Transaction._cache = (signature, txns, index)
+                return True
+            return False
 
     @staticmethod
     def create_transaction(sender, receiver, amount, status):
-        txns = Transaction.load_transactions()
-        txns.append({
-            'sender': sender,
-            'receiver': receiver,
-            'amount': amount,
-            'status': status,
-            'time': datetime.now().isoformat()
-        })
-        Transaction.save_transactions(txns)
-        return True
+        with lock:
+            txns, index = Transaction._load()
+            txn = {
+                'id': uuid.uuid4().hex,
+                'sender': sender,
+                'receiver': receiver,
+                'amount': amount,
+                'status': status,
+                'time': datetime.now().isoformat()
+            }
+            pos = len(txns)
+            index = dict(index)
+            for email in {sender, receiver}:
+                index[email] = index.get(email, []) + [pos]
+            Transaction._store(txns + [txn], index)
+            return dict(txn)
+
+    @staticmethod
+    def get_transaction(txn_id):
+        for txn in Transaction._load()[0]:
+            if txn.get('id') == txn_id:
+                return dict(txn)
+        return None
+
+    @staticmethod
+    def update_status(txn_id, status):
+        with lock:
+            txns, index = Transaction._load()
+            for pos, txn in enumerate(txns):
+                if txn.get('id') == txn_id:
+                    txns = list(txns)
+                    txns[pos] = dict(txn, status=status)
+                    Transaction._store(txns, index)
+                    return True
+            return False
 
     @staticmethod
     def get_user_transactions(email):
-        txns = Transaction.load_transactions()
-        return [txn for txn in txns if txn['sender'] == email or txn['receiver'] == email]
+        txns, index = Transaction._load()
+        return [dict(txns[pos]) for pos in index.get(email, [])]
 
     @staticmethod
     def get_flagged_transactions():
-        txns = Transaction.load_transactions()
-        return [txn for txn in txns if 'FRAUD' in txn['status']]
\ No newline at end of file
+        txns = Transaction._load()[0]
+        return [dict(txn) for txn in txns if 'FRAUD' in txn['status']]
@@ -1,55 +1,100 @@
 import json
-import os
 from ..config import Config
+from .storage import file_signature, lock, write_json
 
 class User:
+    # (file signature, users) of the last read or write of USERS_FILE. The
+    # cached dict is shared between threads, so it is never changed in place:
+    # callers get copies and writers replace it once the file is saved.
+    _cache = None
+
+    @staticmethod
+    def _load():
+        with lock:
+            signature = file_signature(Config.USERS_FILE)
+            if signature is None:
+                User._cache = None
+                return {}
+            if User._cache is not None and User._cache[0] == signature:
+                return User._cache[1]
+            with open(Config.USERS_FILE, 'r') as f:
+                users = json.load(f)
+            User._cache = (signature, users)
+            return users
+
+    @staticmethod
+    def _store(users):
+        with lock:
+            write_json(Config.USERS_FILE, users)
+            User._cache = (file_signature(Config.USERS_FILE), users)
+
+    @staticmethod
+    def _copy(users):
+        return {email: dict(user) for email, user in users.items()}
+
     @staticmethod
     def load_users():
-        if not os.path.exists(Config.USERS_FILE) or os.path.getsize(Config.USERS_FILE) == 0:
-            return {}
-        with open(Config.USERS_FILE, 'r') as f:
-            return json.load(f)
+        return User._copy(User._load())
 
     @staticmethod
     def save_users(users):
-        with open(Config.USERS_FILE, 'w') as f:
-            json.dump(users, f, indent=4)
+        User._store(User._copy(users))
+
+    @staticmethod
+    def cached_state():
+        with lock:
+            User._load()
+            return User._cache
+
+    @staticmethod
+    def prime_cache(signature, users):
+        with lock:
+            if signature is not None and signature == file_signature(Config.USERS_FILE):
+                User._cache = (signature, users)
+                return True
+            return False
 
     @staticmethod
     def get_user(email):
-        users = User.load_users()
-        return users.get(email.lower().strip())
+        user = User._load().get(email.lower().strip())
+        return dict(user) if user is not None else None
 
     @staticmethod
     def create_user(email, password, balance=1000, flagged=False):
-        users = User.load_users()
-        email = email.lower().strip()
-        if email in users:
-            return False
-        users[email] = {
-            'password': password,
-            'balance': balance,
-            'flagged': flagged
-        }
-        User.save_users(users)
-        return True
+        with lock:
+            users = User._load()
+            email = email.lower().strip()
+            if email in users:
+                return False
+            users = dict(users)
+            users[email] = {
+                'password': password,
+                'balance': balance,
+                'flagged': flagged
+            }
+            User._store(users)
+            return True
 
     @staticmethod
     def update_balance(email, amount):
-        users = User.load_users()
-        email = email.lower().strip()
-        if email not in users:
-            return False
-        users[email]['balance'] += amount
-        User.save_users(users)
-        return True
+        with lock:
+            users = User._load()
+            email = email.lower().strip()
+            if email not in users:
+                return False
+            users = dict(users)
+            users[email] = dict(users[email], balance=users[email]['balance'] + amount)
+            User._store(users)
+            return True
 
     @staticmethod
     def flag_user(email, flagged=True):
-        users = User.load_users()
-        email = email.lower().strip()
-        if email not in users:
-            return False
-        users[email]['flagged'] = flagged
-        User.save_users(users)
-        return True
\ No newline at end of file
+        with lock:
+            users = User._load()
+            email = email.lower().strip()
+            if email not in users:
+                return False
+            users = dict(users)
+            users[email] = dict(users[email], flagged=flagged)
+            User._store(users)
+            return True
@@ -3,10 +3,20 @@ from ..config import Config
 from ..models.transaction import Transaction
 from ..models.user import User
 
+THRESHOLD_KEYS = ('FRAUD_THRESHOLD', 'FREQUENCY_THRESHOLD',
+                  'TIME_WINDOW_MINUTES', 'LARGE_WITHDRAWAL_PERCENTAGE')
+
+# Status of a transfer committed before asynchronous scoring has run
+PENDING_REVIEW = "PENDING_REVIEW"
+
 class FraudDetector:
+    @staticmethod
+    def current_thresholds():
+        return {key: getattr(Config, key) for key in THRESHOLD_KEYS}
+
     @staticmethod
     def check_fraud_patterns(sender, amount):
-        txns = Transaction.load_transactions()
+        txns = Transaction.get_user_transactions(sender)
         now = datetime.now()
         time_window = now - timedelta(minutes=Config.TIME_WINDOW_MINUTES)
 
@@ -16,14 +26,45 @@ class FraudDetector:
                and datetime.fromisoformat(t['time']) >= time_window
         ]
 
-        if len(recent_txns) >= Config.FREQUENCY_THRESHOLD:
-            return f"FREQUENCY_FRAUD - {len(recent_txns)} transactions in last {Config.TIME_WINDOW_MINUTES} minutes"
+        sender_balance = User.get_user(sender).get('balance', 0)
+        return FraudDetector.evaluate(amount, sender_balance, len(recent_txns))
 
+    @staticmethod
+    def precheck(amount):
+        """Hard limits only, for the request path when full scoring runs
+        asynchronously."""
         if amount > Config.FRAUD_THRESHOLD:
             return f"AMOUNT_FRAUD - Exceeds ₹{Config.FRAUD_THRESHOLD}"
+        return PENDING_REVIEW
 
-        sender_balance = User.get_user(sender).get('balance', 0)
-        if sender_balance > 0 and amount / sender_balance > Config.LARGE_WITHDRAWAL_PERCENTAGE:
+    @staticmethod
+    def score_transaction(txn, sender_balance):
+        """Full scoring of an already committed transfer, counting the
+        sender's transfers in the window before it."""
+        time = datetime.fromisoformat(txn['time'])
+        time_window = time - timedelta(minutes=Config.TIME_WINDOW_MINUTES)
+
+        recent_count = sum(
+            1 for t in Transaction.get_user_transactions(txn['sender'])
+            if t['sender'] == txn['sender'] and t.get('id') != txn['id']
+               and time_window <= datetime.fromisoformat(t['time']) < time
+        )
+        return FraudDetector.evaluate(txn['amount'], sender_balance, recent_count)
+
+    @staticmethod
+    def evaluate(amount, sender_balance, recent_count, thresholds=None):
+        """Apply the fraud rules to a transfer, given the sender's balance
+        before it and the number of their transfers in the time window."""
+        if thresholds is None:
+            thresholds = FraudDetector.current_thresholds()
+
+        if recent_count >= thresholds['FREQUENCY_THRESHOLD']:
+            return f"FREQUENCY_FRAUD - {recent_count} transactions in last {thresholds['TIME_WINDOW_MINUTES']} minutes"
+
+        if amount > thresholds['FRAUD_THRESHOLD']:
+            return f"AMOUNT_FRAUD - Exceeds ₹{thresholds['FRAUD_THRESHOLD']}"
+
+        if sender_balance > 0 and amount / sender_balance > thresholds['LARGE_WITHDRAWAL_PERCENTAGE']:
             return f"WITHDRAWAL_FRAUD - Withdrawal of {amount/sender_balance:.0%} of total balance"
 
-        return "OK"
\ No newline at end of file
+        return "OK"
@@ -0,0 +1,105 @@
+import queue
+import threading
+import time
+from ..config import Config
+from ..models.transaction import Transaction
+from ..models.user import User
+from .fraud_detection import FraudDetector, PENDING_REVIEW
+from .helpers import Logger
+from .settlement import Settlement
+
+class FraudQueue:
+    """Background workers that run full fraud scoring on committed transfers
+    and settle them through Settlement. A transfer that fails is held for
+    admin review, or refunded to the sender when REVERSE_HELD_TRANSFERS is
+    set, and its sender is flagged."""
+
+    _queue = queue.Queue()
+    _workers = []
+    _pending = {}  # txn id -> time it was enqueued
+    _stats = {'started_at': None, 'scored': 0, 'held': 0, 'reversed': 0,
+              'skipped': 0, 'scoring_seconds': 0.0, 'last_lag_seconds': None}
+    _stats_lock = threading.Lock()
+
+    @staticmethod
+    def start(workers=None):
+        if FraudQueue._workers:
+            return
+        FraudQueue._stats['started_at'] = time.monotonic()
+        for _ in range(workers or Config.FRAUD_SCORING_WORKERS):
+            worker = threading.Thread(target=FraudQueue._work, daemon=True)
+            worker.start()
+            FraudQueue._workers.append(worker)
+
+        threading.Thread(target=FraudQueue._resubmit_pending, daemon=True).start()
+
+    @staticmethod
+    def _resubmit_pending():
+        # Transfers left pending by a previous process; their balance before
+        # the transfer is estimated from the sender's current balance
+        for txn in Transaction.load_transactions():
+            if txn['status'] == PENDING_REVIEW and 'id' in txn:
+                user = User.get_user(txn['sender']) or {}
+                FraudQueue.submit(txn, user.get('balance', 0) + txn['amount'])
+
+    @staticmethod
+    def submit(txn, sender_balance):
+        with FraudQueue._stats_lock:
+            FraudQueue._pending[txn['id']] = time.monotonic()
+        FraudQueue._queue.put((dict(txn), sender_balance))
+
+    @staticmethod
+    def _work():
+        while True:
+            txn, sender_balance = FraudQueue._queue.get()
+            try:
+                FraudQueue._score(txn, sender_balance)
+            except Exception as e:
+                with FraudQueue._stats_lock:
+                    FraudQueue._pending.pop(txn['id'], None)
+                Logger.log_event('SYSTEM', "FRAUD_SCORING_ERROR", f"{txn['id']}: {e}")
+            finally:
+                FraudQueue._queue.task_done()
+
+    @staticmethod
+    def _score(txn, sender_balance):
+        started = time.monotonic()
+        status = FraudDetector.score_transaction(txn, sender_balance)
+        outcome = Settlement.settle_scored(txn['id'], status)
+
+        if outcome in ('held', 'reversed'):
+            Logger.log_event(txn['sender'], "FRAUD_" + outcome.upper(),
+                             f"Transfer of ₹{txn['amount']} to {txn['receiver']} {outcome}, Status: {status}")
+
+        finished = time.monotonic()
+        with FraudQueue._stats_lock:
+            enqueued = FraudQueue._pending.pop(txn['id'], started)
+            stats = FraudQueue._stats
+            if outcome is None:
+                stats['skipped'] += 1
+            else:
+                stats['scored'] += 1
+                stats['scoring_seconds'] += finished - started
+                stats['last_lag_seconds'] = round(finished - enqueued, 3)
+                if outcome != 'passed':
+                    stats[outcome] += 1
+
+    @staticmethod
+    def stats():
+        now = time.monotonic()
+        with FraudQueue._stats_lock:
+            stats = dict(FraudQueue._stats)
+            oldest = min(FraudQueue._pending.values(), default=None)
+
+        started_at = stats.pop('started_at')
+        scoring_seconds = stats.pop('scoring_seconds')
+        uptime = now - started_at if started_at is not None else 0
+        stats.update(
+            running=bool(FraudQueue._workers),
+            workers=len(FraudQueue._workers),
+            queue_depth=FraudQueue._queue.qsize(),
+            oldest_pending_seconds=round(now - oldest, 3) if oldest is not None else 0,
+            scored_per_second=round(stats['scored'] / uptime, 3) if uptime else 0,
+            avg_scoring_ms=round(scoring_seconds / stats['scored'] * 1000, 3) if stats['scored'] else None,
+        )
+        return stats
@@ -0,0 +1,137 @@
+import itertools
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from ..models.transaction import Transaction
+from ..models.user import User
+from .fraud_detection import FraudDetector, PENDING_REVIEW, THRESHOLD_KEYS
+
+class FraudReplay:
+    """Backtest fraud thresholds against the recorded transaction history.
+
+    The history is walked once in time order, keeping a rolling window of
+    send times per sender for each distinct TIME_WINDOW_MINUTES and the
+    running balance of every account, and every threshold configuration in
+    the grid is evaluated against each transfer on the way through."""
+
+    @staticmethod
+    def build_grid(**values):
+        """Cartesian product of threshold values, keyed like Config.
+        Keys that are not given keep their current Config value."""
+        base = FraudDetector.current_thresholds()
+        options = [values.get(key) or [base[key]] for key in THRESHOLD_KEYS]
+        return [dict(zip(THRESHOLD_KEYS, combo)) for combo in itertools.product(*options)]
+
+    @staticmethod
+    def settlement(txn):
+        """Whether a recorded transaction left the sender debited and the
+        receiver credited. Reversed transfers were refunded to the sender;
+        pending and held ones were never credited to the receiver."""
+        status = txn['status']
+        if status.startswith('REVERSED'):
+            return False, False
+        debited = txn['sender'] != 'SYSTEM'
+        return debited, not (status == PENDING_REVIEW or status.startswith('HELD'))
+
+    @staticmethod
+    def load_history():
+        """Transactions in time order, with each account's balance before the
+        first of them (worked back from the current balances)."""
+        txns = sorted(Transaction.load_transactions(), key=lambda t: t['time'])
+        balances = {email: user['balance'] for email, user in User.load_users().items()}
+        for txn in txns:
+            debited, credited = FraudReplay.settlement(txn)
+            if debited:
+                balances[txn['sender']] = balances.get(txn['sender'], 0) + txn['amount']
+            if credited:
+                balances[txn['receiver']] = balances.get(txn['receiver'], 0) - txn['amount']
+        return txns, balances
+
+    @staticmethod
+    def replay(txns, opening_balances, grid):
+        balances = dict(opening_balances)
+        windows = {minutes: {} for minutes in {config['TIME_WINDOW_MINUTES'] for config in grid}}
+        results = [{'thresholds': config, 'flagged': 0, 'newly_flagged': 0,
+                    'cleared': 0, 'reasons': {}} for config in grid]
+        transfers = recorded_flagged = recorded_pending = 0
+
+        for txn in txns:
+            sender, amount = txn['sender'], txn['amount']
+            debited, credited = FraudReplay.settlement(txn)
+            if sender == 'SYSTEM':
+                if credited:
+                    balances[txn['receiver']] = balances.get(txn['receiver'], 0) + amount
+                continue
+
+            time = datetime.fromisoformat(txn['time'])
+            recent = {}
+            for minutes, senders in windows.items():
+                sent = senders.setdefault(sender, deque())
+                cutoff = time - timedelta(minutes=minutes)
+                while sent and sent[0] < cutoff:
+                    sent.popleft()
+                recent[minutes] = len(sent)
+                sent.append(time)
+
+            sender_balance = balances.get(sender, 0)
+            was_flagged = 'FRAUD' in txn['status']
+            transfers += 1
+            recorded_flagged += was_flagged
+            recorded_pending += txn['status'] == PENDING_REVIEW
+
+            for config, result in zip(grid, results):
+                status = FraudDetector.evaluate(amount, sender_balance,
+                                                recent[config['TIME_WINDOW_MINUTES']], config)
+                flagged = 'FRAUD' in status
+                if flagged:
+                    result['flagged'] += 1
+                    reason = status.split(' - ')[0]
+                    result['reasons'][reason] = result['reasons'].get(reason, 0) + 1
+                if flagged and not was_flagged:
+                    result['newly_flagged'] += 1
+                elif was_flagged and not flagged:
+                    result['cleared'] += 1
+
+            if debited:
+                balances[sender] = sender_balance - amount
+            if credited:
+                balances[txn['receiver']] = balances.get(txn['receiver'], 0) + amount
+
+        for result in results:
+            result['transfers'] = transfers
+            result['recorded_flagged'] = recorded_flagged
+            result['recorded_pending'] = recorded_pending
+        return results
+
+    @staticmethod
+    def run(grid, workers=1):
+        txns, balances = FraudReplay.load_history()
+        if workers <= 1 or len(grid) <= 1:
+            return FraudReplay.replay(txns, balances, grid)
+
+        # Each worker makes its own single pass over the history for its
+        # share of the grid
+        workers = min(workers, len(grid))
+        chunks = [grid[i::workers] for i in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunk_results = list(pool.map(FraudReplay.replay,
+                                          itertools.repeat(txns), itertools.repeat(balances), chunks))
+        return [chunk_results[i % workers][i // workers] for i in range(len(grid))]
+
+    @staticmethod
+    def report(results):
+        lines = []
+        for result in results:
+            transfers = result['transfers'] or 1
+            rate = result['flagged'] / transfers
+            recorded_rate = result['recorded_flagged'] / transfers
+            thresholds = ', '.join(f"{key}={value}" for key, value in result['thresholds'].items())
+            reasons = ', '.join(f"{reason}={count}" for reason, count in sorted(result['reasons'].items()))
+            lines.append(f"{thresholds}\n"
+                         f"    flagged {result['flagged']}/{result['transfers']} ({rate:.1%}), "
+                         f"recorded {recorded_rate:.1%}, difference {rate - recorded_rate:+.1%}; "
+                         f"newly flagged {result['newly_flagged']}, cleared {result['cleared']}"
+                         + (f" ({result['recorded_pending']} pending review counted as recorded not flagged)"
+                            if result['recorded_pending'] else "")
+                         + (f"\n    {reasons}" if reasons else ""))
+        return lines
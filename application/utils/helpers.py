@@ -2,22 +2,23 @@ import json
 import os
 from datetime import datetime
 from ..config import Config
+from ..models.storage import lock, write_json
 
 class Logger:
     @staticmethod
     def log_event(user, action, details=""):
-        if not os.path.exists(Config.LOG_FILE):
-            logs = []
-        else:
-            with open(Config.LOG_FILE, 'r') as f:
-                logs = json.load(f) if os.path.getsize(Config.LOG_FILE) > 0 else []
+        with lock:
+            if not os.path.exists(Config.LOG_FILE):
+                logs = []
+            else:
+                with open(Config.LOG_FILE, 'r') as f:
+                    logs = json.load(f) if os.path.getsize(Config.LOG_FILE) > 0 else []
 
-        logs.append({
-            "user": user,
-            "action": action,
-            "details": details,
-            "timestamp": datetime.now().isoformat()
-        })
+            logs.append({
+                "user": user,
+                "action": action,
+                "details": details,
+                "timestamp": datetime.now().isoformat()
+            })
 
-        with open(Config.LOG_FILE, 'w') as f:
-            json.dump(logs, f, indent=4)
\ No newline at end of file
+            write_json(Config.LOG_FILE, logs)
\ No newline at end of file
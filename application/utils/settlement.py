@@ -0,0 +1,70 @@
+from ..config import Config
+from ..models.storage import lock
+from ..models.transaction import Transaction
+from ..models.user import User
+from .fraud_detection import PENDING_REVIEW
+
+HELD_PREFIX = "HELD - "
+
+class Settlement:
+    """Moves the escrowed funds of an asynchronously scored transfer.
+
+    The sender is debited when the transfer is committed; the funds reach
+    the receiver only once it passes scoring or a held transfer is released
+    by an admin. Each transition re-reads the transfer under the data lock
+    and checks its status first, so it happens at most once."""
+
+    @staticmethod
+    def settle_scored(txn_id, status):
+        """Settle a PENDING_REVIEW transfer with its scoring result. Returns
+        'passed', 'held' or 'reversed', or None if it was already settled."""
+        with lock:
+            txn = Transaction.get_transaction(txn_id)
+            if txn is None or txn['status'] != PENDING_REVIEW:
+                return None
+
+            if "FRAUD" not in status:
+                User.update_balance(txn['receiver'], txn['amount'])
+                Transaction.update_status(txn_id, status)
+                return 'passed'
+
+            if Config.REVERSE_HELD_TRANSFERS:
+                User.update_balance(txn['sender'], txn['amount'])
+                Transaction.update_status(txn_id, f"REVERSED - {status}")
+                outcome = 'reversed'
+            else:
+                Transaction.update_status(txn_id, HELD_PREFIX + status)
+                outcome = 'held'
+            User.flag_user(txn['sender'], True)
+            return outcome
+
+    @staticmethod
+    def release_held(txn_id):
+        """Credit a held transfer to its receiver. Returns the transfer, or
+        None if it is not held."""
+        with lock:
+            txn = Settlement._get_held(txn_id)
+            if txn is None:
+                return None
+            User.update_balance(txn['receiver'], txn['amount'])
+            Transaction.update_status(txn_id, "RELEASED - " + txn['status'][len(HELD_PREFIX):])
+            return txn
+
+    @staticmethod
+    def reverse_held(txn_id):
+        """Refund a held transfer to its sender. Returns the transfer, or
+        None if it is not held."""
+        with lock:
+            txn = Settlement._get_held(txn_id)
+            if txn is None:
+                return None
+            User.update_balance(txn['sender'], txn['amount'])
+            Transaction.update_status(txn_id, "REVERSED - " + txn['status'][len(HELD_PREFIX):])
+            return txn
+
+    @staticmethod
+    def _get_held(txn_id):
+        txn = Transaction.get_transaction(txn_id)
+        if txn is None or not txn['status'].startswith(HELD_PREFIX):
+            return None
+        return txn
@@ -0,0 +1,68 @@
+import pickle
+from ..config import Config
+from ..models.storage import atomic_open, lock
+from ..models.user import User
+from ..models.transaction import Transaction
+
+SNAPSHOT_VERSION = 2
+
+class WarmSnapshot:
+    """Binary checkpoint of the parsed users, transactions and per-user
+    transaction index, so a fresh worker can skip re-parsing the JSON files."""
+
+    @staticmethod
+    def save():
+        with lock:
+            user_state = User.cached_state()
+            txn_state = Transaction.cached_state()
+            if user_state is None or txn_state is None:
+                return False
+
+            data = {
+                'version': SNAPSHOT_VERSION,
+                'users': user_state,
+                'transactions': txn_state,
+            }
+            with atomic_open(Config.SNAPSHOT_FILE, 'wb') as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return True
+
+    @staticmethod
+    def _read():
+        """The snapshot contents, or None if it is missing, unreadable or not
+        in the expected shape."""
+        try:
+            with open(Config.SNAPSHOT_FILE, 'rb') as f:
+                data = pickle.load(f)
+            if data['version'] != SNAPSHOT_VERSION:
+                return None
+            user_signature, users = data['users']
+            txn_signature, txns, index = data['transactions']
+            if not (isinstance(users, dict) and isinstance(txns, list) and isinstance(index, dict)):
+                return None
+        except Exception:
+            return None
+        return (user_signature, users), (txn_signature, txns, index)
+
+    @staticmethod
+    def load():
+        """Prime the model caches from the snapshot. Parts whose source JSON
+        file changed since the snapshot was written are ignored and will be
+        parsed from JSON instead. Returns 'snapshot', 'partial' or 'json'."""
+        data = WarmSnapshot._read()
+
+        users_primed = txns_primed = False
+        if data is not None:
+            users_primed = User.prime_cache(*data[0])
+            txns_primed = Transaction.prime_cache(*data[1])
+
+        # Whatever the snapshot could not provide is parsed now rather than
+        # on the first request
+        User.load_users()
+        Transaction.load_transactions()
+
+        if users_primed and txns_primed:
+            return 'snapshot'
+        if users_primed or txns_primed:
+            return 'partial'
+        return 'json'
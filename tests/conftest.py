@@ -0,0 +1,12 @@
+import pytest
+from application.config import Config
+from application.models import User, Transaction
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Point every data file at a fresh temp directory with empty caches."""
+    for name in ('USERS_FILE', 'TXNS_FILE', 'LOG_FILE', 'LOCK_FILE', 'SNAPSHOT_FILE'):
+        monkeypatch.setattr(Config, name, str(tmp_path / getattr(Config, name)))
+    monkeypatch.setattr(User, '_cache', None)
+    monkeypatch.setattr(Transaction, '_cache', None)
+    return tmp_path
@@ -0,0 +1,132 @@
+import json
+import multiprocessing
+from application import create_app
+from application.config import Config
+from application.models import User, Transaction
+from application.utils.fraud_detection import PENDING_REVIEW
+from application.utils.fraud_queue import FraudQueue
+from application.utils.settlement import Settlement
+
+
+def pending_transfer(sender, receiver, amount):
+    """Commit a transfer the way /send does in async mode: the sender is
+    debited and the receiver's credit waits for scoring."""
+    User.update_balance(sender, -amount)
+    return Transaction.create_transaction(sender, receiver, amount, PENDING_REVIEW)
+
+
+def score_all(txns, barrier):
+    barrier.wait()
+    for txn in txns:
+        FraudQueue._score(txn, 100.0)
+
+
+def test_concurrent_scorers_settle_each_transfer_once(data_dir):
+    User.create_user('r@x.com', 'pw', balance=0)
+    for i in range(30):
+        User.create_user(f's{i}@x.com', 'pw', balance=100.0)
+        pending_transfer(f's{i}@x.com', 'r@x.com', 1.0)
+    txns = Transaction.load_transactions()
+
+    ctx = multiprocessing.get_context('fork')
+    barrier = ctx.Barrier(3)
+    scorers = [ctx.Process(target=score_all, args=(txns, barrier)) for _ in range(3)]
+    for scorer in scorers:
+        scorer.start()
+    for scorer in scorers:
+        scorer.join()
+        assert scorer.exitcode == 0
+
+    assert User.get_user('r@x.com')['balance'] == 30.0
+    assert [t['status'] for t in Transaction.load_transactions()] == ['OK'] * 30
+
+
+def balances():
+    return User.get_user('s@x.com')['balance'], User.get_user('r@x.com')['balance']
+
+
+def setup_pair():
+    User.create_user('s@x.com', 'pw', balance=100.0)
+    User.create_user('r@x.com', 'pw', balance=0)
+
+
+def test_passing_transfer_credits_receiver(data_dir):
+    setup_pair()
+    txn = pending_transfer('s@x.com', 'r@x.com', 10.0)
+    FraudQueue._score(txn, 100.0)
+
+    assert balances() == (90.0, 10.0)
+    assert Transaction.get_transaction(txn['id'])['status'] == 'OK'
+
+
+def test_failing_transfer_is_held_back_from_receiver(data_dir):
+    setup_pair()
+    txn = pending_transfer('s@x.com', 'r@x.com', 60.0)
+    FraudQueue._score(txn, 100.0)
+
+    assert balances() == (40.0, 0)
+    assert Transaction.get_transaction(txn['id'])['status'].startswith('HELD - WITHDRAWAL_FRAUD')
+    assert User.get_user('s@x.com')['flagged']
+
+
+def test_failing_transfer_is_refunded_when_reversing(data_dir, monkeypatch):
+    monkeypatch.setattr(Config, 'REVERSE_HELD_TRANSFERS', True)
+    setup_pair()
+    txn = pending_transfer('s@x.com', 'r@x.com', 60.0)
+    FraudQueue._score(txn, 100.0)
+
+    assert balances() == (100.0, 0)
+    assert Transaction.get_transaction(txn['id'])['status'].startswith('REVERSED - WITHDRAWAL_FRAUD')
+
+
+def test_duplicate_submit_is_skipped(data_dir, monkeypatch):
+    setup_pair()
+    txn = pending_transfer('s@x.com', 'r@x.com', 60.0)
+    skipped = FraudQueue.stats()['skipped']
+    FraudQueue._score(txn, 100.0)
+    monkeypatch.setattr(Config, 'REVERSE_HELD_TRANSFERS', True)
+    FraudQueue._score(txn, 100.0)
+
+    assert balances() == (40.0, 0)
+    assert Transaction.get_transaction(txn['id'])['status'].startswith('HELD')
+    assert FraudQueue.stats()['skipped'] == skipped + 1
+
+
+def test_held_transfer_is_released_once(data_dir):
+    setup_pair()
+    txn = pending_transfer('s@x.com', 'r@x.com', 60.0)
+    FraudQueue._score(txn, 100.0)
+
+    assert Settlement.release_held(txn['id'])['amount'] == 60.0
+    assert Settlement.release_held(txn['id']) is None
+    assert Settlement.reverse_held(txn['id']) is None
+    assert balances() == (40.0, 60.0)
+    assert Transaction.get_transaction(txn['id'])['status'].startswith('RELEASED - WITHDRAWAL_FRAUD')
+
+
+def test_held_transfer_is_reversed_once(data_dir):
+    setup_pair()
+    txn = pending_transfer('s@x.com', 'r@x.com', 60.0)
+    FraudQueue._score(txn, 100.0)
+
+    assert Settlement.reverse_held(txn['id']) is not None
+    assert Settlement.reverse_held(txn['id']) is None
+    assert Settlement.release_held(txn['id']) is None
+    assert balances() == (100.0, 0)
+    assert Transaction.get_transaction(txn['id'])['status'].startswith('REVERSED - WITHDRAWAL_FRAUD')
+
+
+def test_admin_release_is_audited(data_dir, monkeypatch):
+    monkeypatch.setattr(Config, 'SNAPSHOT_ON_SHUTDOWN', False)
+    setup_pair()
+    txn = pending_transfer('s@x.com', 'r@x.com', 60.0)
+    FraudQueue._score(txn, 100.0)
+
+    client = create_app().test_client()
+    with client.session_transaction() as session:
+        session['user'] = 'admin@dffdp.com'
+    assert client.get(f"/release_txn/{txn['id']}").status_code == 302
+
+    assert balances() == (40.0, 60.0)
+    with open(Config.LOG_FILE) as f:
+        assert [entry['action'] for entry in json.load(f)][-1] == 'RELEASE_HOLD'
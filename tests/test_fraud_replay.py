@@ -0,0 +1,52 @@
+import json
+from application.config import Config
+from application.utils.fraud_replay import FraudReplay
+
+
+def txn(sender, receiver, amount, status, minute):
+    return {'sender': sender, 'receiver': receiver, 'amount': amount,
+            'status': status, 'time': f'2025-05-18T16:{minute:02d}:00'}
+
+
+HISTORY = [
+    txn('SYSTEM', 'a@x.com', 500.0, 'TOP-UP', 0),
+    txn('a@x.com', 'b@x.com', 100.0, 'OK', 1),
+    txn('a@x.com', 'b@x.com', 1200.0, 'HELD - AMOUNT_FRAUD - Exceeds ₹1000', 2),
+    txn('a@x.com', 'b@x.com', 150.0, 'REVERSED - WITHDRAWAL_FRAUD - Withdrawal of 75% of total balance', 3),
+    txn('a@x.com', 'b@x.com', 50.0, 'OK', 4),
+    txn('a@x.com', 'b@x.com', 10.0, 'OK', 5),
+    txn('a@x.com', 'b@x.com', 10.0, 'FREQUENCY_FRAUD - 5 transactions in last 10 minutes', 6),
+    txn('b@x.com', 'a@x.com', 20.0, 'OK', 30),
+]
+
+
+def write_history(history, users):
+    with open(Config.TXNS_FILE, 'w') as f:
+        json.dump(history, f)
+    with open(Config.USERS_FILE, 'w') as f:
+        json.dump({email: {'password': 'pw', 'balance': balance, 'flagged': False}
+                   for email, balance in users.items()}, f)
+
+
+def test_opening_balances_follow_settlement(data_dir):
+    # The held transfer never reached b and the reversed one was refunded
+    write_history(HISTORY, {'a@x.com': 150.0, 'b@x.com': 1150.0})
+    _, balances = FraudReplay.load_history()
+    assert balances == {'a@x.com': 1000.0, 'b@x.com': 1000.0}
+
+
+def test_replay_reproduces_recorded_statuses(data_dir):
+    write_history(HISTORY, {'a@x.com': 150.0, 'b@x.com': 1150.0})
+    [result] = FraudReplay.run(FraudReplay.build_grid())
+
+    assert result['transfers'] == 7
+    assert result['flagged'] == result['recorded_flagged'] == 3
+    assert result['newly_flagged'] == result['cleared'] == 0
+    assert result['reasons'] == {'AMOUNT_FRAUD': 1, 'WITHDRAWAL_FRAUD': 1, 'FREQUENCY_FRAUD': 1}
+
+
+def test_grid_split_across_workers_matches_single_pass(data_dir):
+    write_history(HISTORY, {'a@x.com': 150.0, 'b@x.com': 1150.0})
+    grid = FraudReplay.build_grid(FRAUD_THRESHOLD=[100, 1000], FREQUENCY_THRESHOLD=[3, 5])
+    assert FraudReplay.run(grid, workers=2) == FraudReplay.run(grid)
+    assert [r['thresholds'] for r in FraudReplay.run(grid, workers=2)] == grid
@@ -0,0 +1,69 @@
+import threading
+import pytest
+from application.models import User, Transaction
+from application.models import user as user_module
+
+
+def test_loaded_users_are_copies(data_dir):
+    User.create_user('a@x.com', 'pw')
+    users = User.load_users()
+    users['a@x.com']['balance'] = 0
+    users['b@x.com'] = {}
+    User.get_user('a@x.com')['balance'] = 0
+
+    assert User.get_user('a@x.com')['balance'] == 1000
+    assert 'b@x.com' not in User.load_users()
+
+
+def test_writes_do_not_change_loaded_users(data_dir):
+    User.create_user('a@x.com', 'pw')
+    users = User.load_users()
+    User.update_balance('a@x.com', 5)
+    User.create_user('b@x.com', 'pw')
+
+    assert users == {'a@x.com': {'password': 'pw', 'balance': 1000, 'flagged': False}}
+    assert User.get_user('a@x.com')['balance'] == 1005
+
+
+def test_failed_write_keeps_cache(data_dir, monkeypatch):
+    User.create_user('a@x.com', 'pw')
+
+    def fail(path, data):
+        raise OSError("disk full")
+    monkeypatch.setattr(user_module, 'write_json', fail)
+
+    with pytest.raises(OSError):
+        User.update_balance('a@x.com', 5)
+    assert User.get_user('a@x.com')['balance'] == 1000
+
+
+def test_iterating_users_during_writes(data_dir):
+    User.create_user('a@x.com', 'pw')
+    done = threading.Event()
+
+    def register():
+        for i in range(200):
+            User.create_user(f'user{i}@x.com', 'pw')
+        done.set()
+
+    writer = threading.Thread(target=register)
+    writer.start()
+    while not done.is_set():
+        for email, user in User.load_users().items():
+            user['balance']
+    writer.join()
+    assert len(User.load_users()) == 201
+
+
+def test_transactions_are_copies(data_dir):
+    txn = Transaction.create_transaction('a@x.com', 'b@x.com', 10.0, 'OK')
+    history = Transaction.get_user_transactions('a@x.com')
+    txn['status'] = 'CHANGED'
+    history[0]['amount'] = 0
+    Transaction.create_transaction('a@x.com', 'c@x.com', 20.0, 'OK')
+    Transaction.update_status(txn['id'], 'HELD')
+
+    assert len(history) == 1 and history[0]['status'] == 'OK'
+    assert [(t['amount'], t['status']) for t in Transaction.get_user_transactions('a@x.com')] == \
+        [(10.0, 'HELD'), (20.0, 'OK')]
+    assert [t['amount'] for t in Transaction.get_user_transactions('c@x.com')] == [20.0]